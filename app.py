@@ -1,15 +1,22 @@
-import json
+import collections
+import functools
+import hashlib
+import heapq
+import hmac
 import os
 import time
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 
+import orjson
 import streamlit as st
+import streamlit.components.v1 as components
 
 # ----------------------------
 # Config
 # ----------------------------
 CTF_DURATION_SECONDS = 3 * 60 * 60  # 3 hours
 BANK_PATH = "challenge_bank.json"
+SOLVE_LOG_MAX = 50  # newest solves kept in the local log
 
 CATEGORIES = ["web", "osint", "crypto", "forensics", "misc"]
 CATEGORY_LABELS = {
@@ -23,48 +30,139 @@ CATEGORY_LABELS = {
 # ----------------------------
 # Helpers
 # ----------------------------
-def load_bank(path: str) -> Dict[str, List[Dict[str, Any]]]:
+# Caches are server-wide: bound them so old bank versions and every room code
+# anyone ever typed don't stay in memory for the life of the process.
+@st.cache_data(show_spinner=False, max_entries=2)
+def load_bank(path: str, mtime: float) -> Dict[str, List[Dict[str, Any]]]:
+    """Parse the bank; `mtime` is only a cache key so edits to the file invalidate it."""
     if not os.path.exists(path):
         return {c: [] for c in CATEGORIES}
-    with open(path, "r", encoding="utf-8") as f:
-        bank = json.load(f)
+    with open(path, "rb") as f:
+        bank = orjson.loads(f.read())
     for c in CATEGORIES:
         bank.setdefault(c, [])
+        for ch in bank[c]:
+            normalize_challenge(ch)
     return bank
 
+def normalize_challenge(ch: Dict[str, Any]):
+    """Coerce optional fields once at load so renderers can read them directly."""
+    ch["tags"] = [str(t) for t in (ch.get("tags") or [])]
+    ch["difficulty"] = str(ch.get("difficulty") or "").strip()
+    ch["attachments"] = [a for a in (ch.get("attachments") or []) if isinstance(a, dict) and a.get("url")]
+    w = ch.get("writeup")
+    ch["writeup"] = w if isinstance(w, dict) else None
+    link = ch.get("external_link")
+    ch["external_link"] = link if isinstance(link, str) and link else None
+
+def bank_mtime(path: str) -> float:
+    return os.path.getmtime(path) if os.path.exists(path) else 0.0
+
 def normalize_flag(s: str) -> str:
     return (s or "").strip()
 
+def flags_match(got: str, correct: str) -> bool:
+    """Constant-time compare so response timing doesn't leak the flag prefix."""
+    if len(got) != len(correct):
+        return False
+    return hmac.compare_digest(got.encode("utf-8"), correct.encode("utf-8"))
+
 def now_epoch() -> int:
     return int(time.time())
 
-def fmt_hms(seconds: int) -> str:
-    h = seconds // 3600
-    m = (seconds % 3600) // 60
-    s = seconds % 60
-    return f"{h:02d}:{m:02d}:{s:02d}"
-
 def remaining_seconds(started_at: int) -> int:
     elapsed = now_epoch() - started_at
     return max(0, CTF_DURATION_SECONDS - elapsed)
 
+def render_countdown(started_at: int):
+    """Metric-style countdown that ticks in the browser, so no rerun per second.
+
+    Uses components.html because st.markdown does not execute <script> tags.
+    The HTML depends only on `started_at`, so reruns don't reload the iframe.
+    """
+    end = started_at + CTF_DURATION_SECONDS
+    # The iframe can't see the app theme: use the configured theme if any, else
+    # follow the OS light/dark preference like Streamlit's default theme does.
+    # Copied from Streamlit's built-in light/dark theme textColor; keep in sync
+    light, dark = "rgb(49, 51, 63)", "rgb(250, 250, 250)"
+    text_color = st.get_option("theme.textColor")
+    base = st.get_option("theme.base")
+    if text_color:
+        color_css = f"#ctf_box {{ color: {text_color}; }}"
+    elif base in ("light", "dark"):
+        color_css = f"#ctf_box {{ color: {light if base == 'light' else dark}; }}"
+    else:
+        color_css = (
+            f"#ctf_box {{ color: {light}; }}\n"
+            f"@media (prefers-color-scheme: dark) {{ #ctf_box {{ color: {dark}; }} }}"
+        )
+    components.html(
+        f"""
+<style>{color_css}</style>
+<div id="ctf_box" style="font-family: 'Source Sans Pro', sans-serif;">
+  <div style="font-size: 14px;">Time left</div>
+  <div id="ctf_timer" data-end="{end}" style="font-size: 36px; line-height: 1.4;"></div>
+</div>
+<script>
+(function() {{
+  var el = document.getElementById("ctf_timer");
+  var end = +el.dataset.end;
+  function pad(n) {{ return String(n).padStart(2, "0"); }}
+  function tick() {{
+    var r = Math.max(0, end - Math.floor(Date.now() / 1000));
+    el.textContent = pad(Math.floor(r / 3600)) + ":" + pad(Math.floor(r / 60) % 60) + ":" + pad(r % 60);
+  }}
+  tick();
+  setInterval(tick, 1000);
+}})();
+</script>
+""",
+        height=80,
+    )
+
 def points_for(ch: Dict[str, Any]) -> int:
     try:
         return int(ch.get("points", 0))
     except Exception:
         return 0
 
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+def _mmh64(key: bytes, seed: int) -> int:
+    """MurmurHash64A. Unlike hash(), stable across processes (no PYTHONHASHSEED)."""
+    m = 0xC6A4A7935BD1E995
+    r = 47
+    n = len(key)
+    h = (seed ^ (n * m)) & _MASK64
+
+    end = n - (n & 7)
+    for i in range(0, end, 8):
+        k = int.from_bytes(key[i:i + 8], "little")
+        k = (k * m) & _MASK64
+        k ^= k >> r
+        k = (k * m) & _MASK64
+        h ^= k
+        h = (h * m) & _MASK64
+
+    if n & 7:
+        h ^= int.from_bytes(key[end:], "little")
+        h = (h * m) & _MASK64
+
+    h ^= h >> r
+    h = (h * m) & _MASK64
+    h ^= h >> r
+    return h
+
 def seeded_sample(items: List[Dict[str, Any]], k: int, seed: int) -> List[Dict[str, Any]]:
-    """Deterministic 'random' sample based on hash."""
+    """Deterministic 'random' sample: the k items with the smallest seeded id hash."""
     if not items:
         return []
-    scored = []
-    for it in items:
-        key = f"{seed}:{it.get('id','')}:{it.get('title','')}"
-        h = abs(hash(key))
-        scored.append((h, it))
-    scored.sort(key=lambda x: x[0])
-    return [it for _, it in scored[: min(k, len(scored))]]
+    seed &= _MASK64
+    return heapq.nsmallest(
+        min(k, len(items)),
+        items,
+        key=lambda it: _mmh64(str(it.get("id", "")).encode("utf-8"), seed),
+    )
 
 def build_room_challenges(bank: Dict[str, List[Dict[str, Any]]], room_seed: int) -> Dict[str, List[Dict[str, Any]]]:
     per_cat = {}
@@ -72,21 +170,57 @@ def build_room_challenges(bank: Dict[str, List[Dict[str, Any]]], room_seed: int)
         per_cat[c] = seeded_sample(bank.get(c, []), 5, room_seed)
     return per_cat
 
+@st.cache_data(show_spinner=False, max_entries=256)
+def _build_room_challenges_cached(
+    bank_mtime: float, room_seed: int
+) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[Tuple[str, str], Dict[str, Any]]]:
+    """Board for a room plus a (category, id) -> challenge index.
+
+    Each challenge also gets precomputed `_points` and normalized `_flag`.
+
+    Rebuilt only when the bank file or the room seed changes.
+    """
+    per_cat = build_room_challenges(load_bank(BANK_PATH, bank_mtime), room_seed)
+    for chs in per_cat.values():
+        for ch in chs:
+            ch["_points"] = points_for(ch)
+            ch["_flag"] = normalize_flag(ch.get("flag", ""))
+    index = {(cat, ch.get("id", "")): ch for cat, chs in per_cat.items() for ch in chs}
+    return per_cat, index
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def _counts_md(bank_mtime: float) -> str:
+    bank = load_bank(BANK_PATH, bank_mtime)
+    return "\n".join(f"- {CATEGORY_LABELS[c]}: {len(bank.get(c, []))}" for c in CATEGORIES)
+
+@functools.lru_cache(maxsize=512)
+def _flag_key(cat: str, cid: str) -> str:
+    return f"flag_input_{cat}_{cid}"
+
+def prune_flag_inputs(room_index: Dict[Tuple[str, str], Dict[str, Any]]):
+    """Drop flag_input_* state left over from challenges not on this board."""
+    keep = {_flag_key(cat, cid) for cat, cid in room_index}
+    for k in [k for k in st.session_state if isinstance(k, str) and k.startswith("flag_input_") and k not in keep]:
+        del st.session_state[k]
+
 def init_state():
     st.session_state.setdefault("room_code", "")
     st.session_state.setdefault("player_name", "")
     st.session_state.setdefault("room_started_at", None)
     st.session_state.setdefault("room_seed", None)
     st.session_state.setdefault("selected", None)
+    st.session_state.setdefault("last_selected", None)  # for dropping stale flag inputs
     st.session_state.setdefault("solved", set())
     st.session_state.setdefault("score", 0)
-    st.session_state.setdefault("team_log", [])  # local log
+    st.session_state.setdefault("team_log", collections.deque(maxlen=SOLVE_LOG_MAX))  # local log, newest first: (HH:MM:SS, player, id, pts)
     st.session_state.setdefault("last_submit", None)  # tuple(kind, msg)
     st.session_state.setdefault("do_balloons", False)
+    st.session_state.setdefault("expired", False)
+    st.session_state.setdefault("score_changed", False)  # timer fragment must redraw the score
 
 def render_tags_and_difficulty(ch: Dict[str, Any]):
-    tags = ch.get("tags", []) or []
-    difficulty = (ch.get("difficulty") or "").strip()
+    tags = ch["tags"]
+    difficulty = ch["difficulty"]
     parts = []
     if difficulty:
         parts.append(f"**Difficulty:** {difficulty}")
@@ -96,26 +230,24 @@ def render_tags_and_difficulty(ch: Dict[str, Any]):
         st.caption(" | ".join(parts))
 
 def render_external_link(ch: Dict[str, Any]):
-    link = ch.get("external_link")
-    if link and isinstance(link, str):
+    link = ch["external_link"]
+    if link:
         st.link_button("Open external link", link)
 
 def render_attachments(ch: Dict[str, Any]):
-    atts = ch.get("attachments", []) or []
+    atts = ch["attachments"]
     if not atts:
         return
     st.markdown("### Attachments")
     for a in atts:
         name = a.get("name", "download")
-        url = a.get("url")
         ftype = a.get("type", "")
-        if url:
-            label = f"Download: {name}" + (f" ({ftype})" if ftype else "")
-            st.link_button(label, url)
+        label = f"Download: {name}" + (f" ({ftype})" if ftype else "")
+        st.link_button(label, a["url"])
 
 def can_show_writeup(ch: Dict[str, Any], solved: bool) -> bool:
-    w = ch.get("writeup")
-    if not isinstance(w, dict):
+    w = ch["writeup"]
+    if w is None:
         return False
     mode = (w.get("visible") or "after_solve").lower()
     if mode == "always":
@@ -125,8 +257,8 @@ def can_show_writeup(ch: Dict[str, Any], solved: bool) -> bool:
     return False  # "never" or unknown
 
 def render_writeup(ch: Dict[str, Any], solved: bool):
-    w = ch.get("writeup")
-    if not isinstance(w, dict):
+    w = ch["writeup"]
+    if w is None:
         return
     if can_show_writeup(ch, solved):
         with st.expander("Writeup / Solution"):
@@ -135,18 +267,33 @@ def render_writeup(ch: Dict[str, Any], solved: bool):
 # ----------------------------
 # Submit callback (IMPORTANT)
 # ----------------------------
-def handle_submit(flag_key: str, correct_flag: str, sel_id: str, pts: int, player: str):
+def handle_submit(flag_key: str, sel: Tuple[str, str], player: str):
+    # The board fragment never checks the clock, so expiry is enforced here too
+    if remaining_seconds(st.session_state.room_started_at) <= 0:
+        st.session_state.expired = True
+        st.session_state.last_submit = ("error", "Time is up.")
+        st.session_state[flag_key] = ""
+        return
+
+    _, room_index = _build_room_challenges_cached(bank_mtime(BANK_PATH), st.session_state.room_seed)
+    ch = room_index.get(sel)
     got = normalize_flag(st.session_state.get(flag_key, ""))
-    correct = normalize_flag(correct_flag)
 
-    if not got:
+    if ch is None:
+        st.session_state.last_submit = ("error", "That challenge is not on the current board anymore (bank changed).")
+    elif sel[1] in st.session_state.solved:
+        st.session_state.last_submit = ("error", "You already solved this challenge.")
+    elif not got:
         st.session_state.last_submit = ("error", "Flag cannot be empty.")
-    elif got == correct:
+    elif flags_match(got, ch["_flag"]):
+        sel_id = sel[1]
+        pts = ch["_points"]
         st.session_state.solved.add(sel_id)
         st.session_state.score += pts
-        st.session_state.team_log.append((now_epoch(), player or "Player", sel_id, pts))
+        st.session_state.team_log.appendleft((time.strftime("%H:%M:%S"), player or "Player", sel_id, pts))
         st.session_state.last_submit = ("success", f"Correct! +{pts} points.")
         st.session_state.do_balloons = True
+        st.session_state.score_changed = True
     else:
         st.session_state.last_submit = ("error", "Wrong flag.")
 
@@ -159,8 +306,7 @@ def handle_submit(flag_key: str, correct_flag: str, sel_id: str, pts: int, playe
 st.set_page_config(page_title="Mini CTF Practice", layout="wide")
 init_state()
 
-# Load bank (if JSON is invalid, you'll get JSONDecodeError—fix commas/quotes)
-bank = load_bank(BANK_PATH)
+mtime = bank_mtime(BANK_PATH)
 
 st.title("Mini Jeopardy CTF Practice (Duo Ready)")
 
@@ -177,8 +323,15 @@ with st.sidebar:
         if not st.session_state.room_code.strip():
             st.error("Room code is required.")
         else:
-            seed = abs(hash(st.session_state.room_code.strip().lower())) % (10**9)
+            # blake2b, not hash(): the seed must match across processes for duo boards
+            seed = int.from_bytes(
+                hashlib.blake2b(st.session_state.room_code.strip().lower().encode("utf-8"), digest_size=8).digest(),
+                "big",
+            )
+            if seed != st.session_state.room_seed:
+                st.session_state.pop("board", None)  # row selection refers to the old board
             st.session_state.room_seed = seed
+            prune_flag_inputs(_build_room_challenges_cached(mtime, seed)[1])
             if st.session_state.room_started_at is None:
                 st.session_state.room_started_at = now_epoch()
             st.success(f"Joined room: {st.session_state.room_code}")
@@ -187,160 +340,195 @@ with st.sidebar:
         st.session_state.room_started_at = None
         st.session_state.room_seed = None
         st.session_state.selected = None
+        st.session_state.last_selected = None
+        st.session_state.pop("board", None)
         st.session_state.solved = set()
         st.session_state.score = 0
-        st.session_state.team_log = []
+        st.session_state.team_log = collections.deque(maxlen=SOLVE_LOG_MAX)
         st.session_state.last_submit = None
         st.session_state.do_balloons = False
+        st.session_state.expired = False
         st.info("Reset done (this browser session).")
 
     st.divider()
     st.header("Challenge Bank")
     st.caption("Edit challenge_bank.json. Keep unique IDs per challenge.")
     st.write("Counts:")
-    for c in CATEGORIES:
-        st.write(f"- {CATEGORY_LABELS[c]}: {len(bank.get(c, []))}")
+    st.markdown(_counts_md(mtime))
 
 # Must join room first
-if not st.session_state.room_seed or not st.session_state.room_started_at:
+if st.session_state.room_seed is None or not st.session_state.room_started_at:
     st.warning("Enter a Room Code in the sidebar, then click **Start / Join Room**.")
     st.stop()
 
-# Countdown + score
-rem = remaining_seconds(st.session_state.room_started_at)
+# Countdown + score. The clock ticks client-side; this fragment only re-syncs
+# once a minute to notice expiry (or right after a solve, see _board_fragment).
+@st.fragment(run_every="60s")
+def _timer_fragment():
+    rem = remaining_seconds(st.session_state.room_started_at)
+    st.session_state.score_changed = False
+
+    top1, top2, top3 = st.columns([2, 1, 1])
+    with top1:
+        st.subheader(f"Room: {st.session_state.room_code}")
+    with top2:
+        render_countdown(st.session_state.room_started_at)
+    with top3:
+        st.metric("Your score", st.session_state.score)
 
-top1, top2, top3 = st.columns([2, 1, 1])
-with top1:
-    st.subheader(f"Room: {st.session_state.room_code}")
-with top2:
-    st.metric("Time left", fmt_hms(rem))
-with top3:
-    st.metric("Your score", st.session_state.score)
+    if rem <= 0 and not st.session_state.expired:
+        st.session_state.expired = True
+        st.rerun()  # full-app rerun so the board below gets locked
 
-if rem <= 0:
+_timer_fragment()
+
+if st.session_state.expired:
     st.error("Time is up. Reset the room to play again (sidebar).")
     st.stop()
 
-room_board = build_room_challenges(bank, st.session_state.room_seed)
+room_board, room_index = _build_room_challenges_cached(mtime, st.session_state.room_seed)
 
 st.caption("Board is randomized by Room Code. Each category shows up to 5 challenges.")
 
-# Board tiles
-cols = st.columns(len(CATEGORIES))
-
-def choose_challenge(category: str, ch_id: str):
-    st.session_state.selected = (category, ch_id)
-
-for i, cat in enumerate(CATEGORIES):
-    with cols[i]:
-        st.markdown(f"### {CATEGORY_LABELS[cat]}")
-        if not room_board.get(cat):
-            st.info("No challenges in bank yet.")
-            continue
+def render_board(room_board: Dict[str, List[Dict[str, Any]]]):
+    """One selectable table instead of a button per tile (one widget per rerun)."""
+    # Locals for the row loop (LOAD_FAST instead of global/attribute lookups)
+    cats = CATEGORIES
+    solved_set = st.session_state.solved
+    keys = []
+    rows = []
 
-        for ch in room_board[cat]:
+    for cat in cats:
+        for ch in room_board.get(cat, []):
             cid = ch.get("id", "")
-            title = ch.get("title", "Untitled")
-            pts = points_for(ch)
-            solved = cid in st.session_state.solved
-
-            label = f"{title} ({pts})"
-            if solved:
-                label = f"✅ {label}"
-
-            st.button(
-                label,
-                key=f"tile_{cat}_{cid}",
-                use_container_width=True,
-                on_click=choose_challenge,
-                args=(cat, cid)
-            )
+            solved = cid in solved_set
+            keys.append((cat, cid))
+            rows.append({
+                "Category": CATEGORY_LABELS[cat],
+                "Challenge": f"{'✅ ' if solved else ''}{ch.get('title', 'Untitled')}",
+                "Points": ch["_points"],
+            })
+
+    empty = [CATEGORY_LABELS[c] for c in cats if not room_board.get(c)]
+    if empty:
+        st.info("No challenges in bank yet: " + ", ".join(empty))
+    if not rows:
+        return
 
-# Selected challenge panel
-st.divider()
+    event = st.dataframe(
+        rows,
+        key="board",
+        hide_index=True,
+        use_container_width=True,
+        on_select="rerun",
+        selection_mode="single-row",
+    )
+    picked = event.selection.rows
+    # An empty selection keeps the open challenge: Streamlit also drops the
+    # selection whenever the table data changes (e.g. a solve adds ✅), so it
+    # can't be told apart from the user unselecting the row.
+    if picked:
+        st.session_state.selected = keys[picked[0]]
+
+def render_selected(room_index: Dict[Tuple[str, str], Dict[str, Any]]) -> bool:
+    """Selected challenge panel. Returns False when there is nothing to show."""
+    st.divider()
 
-if not st.session_state.selected:
-    st.info("Click a challenge tile to open it.")
-    st.stop()
+    if not st.session_state.selected:
+        st.info("Click a challenge row to open it.")
+        return False
 
-sel_cat, sel_id = st.session_state.selected
+    sel_cat, sel_id = st.session_state.selected
 
-selected_ch = None
-for ch in room_board.get(sel_cat, []):
-    if ch.get("id") == sel_id:
-        selected_ch = ch
-        break
+    last = st.session_state.last_selected
+    if last is not None and last != st.session_state.selected:
+        st.session_state.pop(_flag_key(*last), None)
+    st.session_state.last_selected = st.session_state.selected
 
-if not selected_ch:
-    st.warning("That challenge is not on the current board anymore (bank changed). Click another tile.")
-    st.stop()
+    selected_ch = room_index.get((sel_cat, sel_id))
 
-# Show submit result messages (from callback)
-if st.session_state.last_submit:
-    kind, msg = st.session_state.last_submit
-    if kind == "success":
-        st.success(msg)
-    else:
-        st.error(msg)
-    st.session_state.last_submit = None
+    if not selected_ch:
+        st.warning("That challenge is not on the current board anymore (bank changed). Click another row.")
+        return False
+
+    # Show submit result messages (from callback)
+    if st.session_state.last_submit:
+        kind, msg = st.session_state.last_submit
+        if kind == "success":
+            st.success(msg)
+        else:
+            st.error(msg)
+        st.session_state.last_submit = None
 
-if st.session_state.do_balloons:
-    st.balloons()
-    st.session_state.do_balloons = False
+    if st.session_state.do_balloons:
+        st.balloons()
+        st.session_state.do_balloons = False
 
-st.markdown(f"## {CATEGORY_LABELS[sel_cat]} → {selected_ch.get('title','Untitled')}")
-st.markdown(selected_ch.get("prompt", "") or "")
+    st.markdown(f"## {CATEGORY_LABELS[sel_cat]} → {selected_ch.get('title','Untitled')}")
+    st.markdown(selected_ch.get("prompt", "") or "")
 
-render_tags_and_difficulty(selected_ch)
-render_external_link(selected_ch)
-render_attachments(selected_ch)
+    render_tags_and_difficulty(selected_ch)
+    render_external_link(selected_ch)
+    render_attachments(selected_ch)
 
-# Hint (nice rendering)
-hint = selected_ch.get("hint", "")
-if hint:
-    with st.expander("Hint"):
-        st.code(hint, language="text")
+    # Hint (nice rendering)
+    hint = selected_ch.get("hint", "")
+    if hint:
+        with st.expander("Hint"):
+            st.code(hint, language="text")
 
-already = sel_id in st.session_state.solved
-if already:
-    st.success("You already solved this challenge (in this browser session).")
+    already = sel_id in st.session_state.solved
+    if already:
+        st.success("You already solved this challenge (in this browser session).")
 
-# Flag input (keyed per challenge)
-flag_key = f"flag_input_{sel_cat}_{sel_id}"
-if flag_key not in st.session_state:
-    st.session_state[flag_key] = ""
+    # Flag input (keyed per challenge)
+    flag_key = _flag_key(sel_cat, sel_id)
+    st.session_state.setdefault(flag_key, "")
 
-st.text_input(
-    "Submit flag",
-    placeholder="flag{...}",
-    disabled=already,
-    key=flag_key
-)
-
-st.button(
-    "Submit",
-    type="primary",
-    disabled=already,
-    on_click=handle_submit,
-    args=(
-        flag_key,
-        selected_ch.get("flag", ""),
-        sel_id,
-        points_for(selected_ch),
-        st.session_state.player_name or "Player"
+    st.text_input(
+        "Submit flag",
+        placeholder="flag{...}",
+        disabled=already,
+        key=flag_key
     )
-)
 
-# Writeup (optional; show after solve / always)
-render_writeup(selected_ch, solved=(sel_id in st.session_state.solved))
+    st.button(
+        "Submit",
+        type="primary",
+        disabled=already,
+        on_click=handle_submit,
+        args=(
+            flag_key,
+            (sel_cat, sel_id),
+            st.session_state.player_name or "Player"
+        )
+    )
 
-# Local scoreboard
-st.divider()
-st.subheader("Local Solve Log (this browser)")
-if not st.session_state.team_log:
-    st.caption("No solves yet.")
-else:
-    for ts, player, cid, pts in reversed(st.session_state.team_log):
-        st.write(f"- {time.strftime('%H:%M:%S', time.localtime(ts))} — **{player}** solved `{cid}` (+{pts})")
+    # Writeup (optional; show after solve / always)
+    render_writeup(selected_ch, solved=already)
+    return True
 
-st.caption("Want shared duo scoreboard + shared timer across devices? Next step is adding Supabase.")
+def render_solve_log():
+    st.divider()
+    st.subheader("Local Solve Log (this browser)")
+    if not st.session_state.team_log:
+        st.caption("No solves yet.")
+    else:
+        st.markdown("\n".join(
+            f"- {hms} — **{player}** solved `{cid}` (+{pts})"
+            for hms, player, cid, pts in st.session_state.team_log
+        ))
+
+    st.caption("Want shared duo scoreboard + shared timer across devices? Next step is adding Supabase.")
+
+# Row selections and flag submits rerun only this fragment, not the sidebar/timer.
+# The panel and log live here too: a fragment rerun can't refresh other fragments.
+@st.fragment
+def _board_fragment(room_board: Dict[str, List[Dict[str, Any]]], room_index: Dict[Tuple[str, str], Dict[str, Any]]):
+    if st.session_state.score_changed or st.session_state.expired:
+        st.rerun()  # full-app rerun to refresh the score metric / lock the board
+    render_board(room_board)
+    if render_selected(room_index):
+        render_solve_log()
+
+_board_fragment(room_board, room_index)